@@ -1,42 +1,127 @@
 """Defines flow ingesting UniProt xml files data into neo4j."""
+import functools
 import os
+import threading
 from pathlib import Path
+from typing import Iterable
 
 import py2neo
 from prefect import flow, task
+from prefect.task_runners import ConcurrentTaskRunner
 
 from prot.uniprot2graph_config import UNITPROT2GRAPTH_CONFIG
-from prot.xml_extract import extract_graph
+from prot.xml_extract import (
+    PropertiesSubgraphHandler,
+    SubgraphBatch,
+    SubgraphBatches,
+    XML2GraphConfig,
+)
 
 DEFAULT_DATA_DIR = os.environ.get("DATA_DIR", "./data")
 
+DEFAULT_TRANSACTION_SIZE = 50_000
 
-@task
-def extract_from_xml(xml_file: Path) -> py2neo.Subgraph:
+_thread_local = threading.local()
+
+
+def thread_handler() -> PropertiesSubgraphHandler:
+    """Returns the UniProt parsing handler of the current thread.
+
+    The handler is created once per thread, and reused for the files extracted
+    in that thread.
+
+    Returns:
+        The parsing handler.
+    """
+    try:
+        handler: PropertiesSubgraphHandler = _thread_local.handler
+    except AttributeError:
+        handler = PropertiesSubgraphHandler([], [], config=UNITPROT2GRAPTH_CONFIG)
+        _thread_local.handler = handler
+    return handler
+
+
+@functools.lru_cache(maxsize=1)
+def _graph() -> py2neo.Graph:
+    return py2neo.Graph()
+
+
+def ensure_indexes(graph: py2neo.Graph, config: XML2GraphConfig) -> None:
+    """Creates the indexes configured for the extracted graphs, if missing.
+
+    Args:
+        graph (py2neo.Graph): the graph to create the indexes in.
+        config (XML2GraphConfig): configures XML to graph translation.
+    """
+    for label, property_name in sorted(config.indexed_properties):
+        graph.run(
+            f"CREATE INDEX IF NOT EXISTS FOR (n:`{label}`) ON (n.`{property_name}`)"
+        )
+
+
+@task(persist_result=False)
+def extract_from_xml(xml_file: Path) -> SubgraphBatches:
     """Task for extracting a properties subgraphs from a xml file.
 
+    The extraction is lazy. The xml is parsed as the subgraphs are consumed,
+    so that only a batch of the extracted graph is in memory at a time.
+    The parsing reuses the handler of the consuming thread.
+
     Args:
         xml_file (Path): xml file to extract.
 
     Returns:
-        A properties Subgraph extracted from the xml.
+        Batches of the properties Subgraph extracted from the xml.
     """
-    return extract_graph(xml_file, UNITPROT2GRAPTH_CONFIG)
+    return SubgraphBatches(
+        xml_file, UNITPROT2GRAPTH_CONFIG, handler_factory=thread_handler
+    )
+
 
+@task(persist_result=False)
+def load_into_neo4j(
+    subgraphs: Iterable[py2neo.Subgraph],
+    transaction_size: int = DEFAULT_TRANSACTION_SIZE,
+) -> None:
+    """Task for loading properties Subgraphs into neo4j.
 
-@task
-def load_into_neo4j(subgraphs: py2neo.Subgraph) -> None:
-    """Task for loading a properties Subgraph into neo4j.
+    The connection pool to neo4j is shared by all the loads.
+    Consecutive Subgraphs are created in the same transaction, until it holds
+    at least transaction_size nodes. py2neo groups the nodes of each Subgraph
+    by labels and its relationships by type, creating each group with one
+    UNWIND statement.
+    The nodes of previous batches that a SubgraphBatch lists as updated are
+    pushed, since creating them again leaves them unchanged.
+    If extracting or loading a Subgraph fails, the open transaction is rolled
+    back, while the committed ones are kept.
 
     Args:
-        subgraphs (py2neo.Subgraph): a properties Subgraphs.
+        subgraphs (Iterable[py2neo.Subgraph]): properties Subgraphs.
+        transaction_size (int): minimum number of nodes in every transaction
+            but the last.
     """
-    graph = py2neo.Graph()
-    for subgraph in subgraphs:
-        graph.create(subgraph)
+    graph = _graph()
+    transaction = graph.begin()
+    transaction_nodes = 0
+    try:
+        for subgraph in subgraphs:
+            transaction.create(subgraph)
+            if isinstance(subgraph, SubgraphBatch) and subgraph.updated_nodes:
+                transaction.push(py2neo.Subgraph(subgraph.updated_nodes))
+            transaction_nodes += len(subgraph.nodes)
+            if transaction_nodes >= transaction_size:
+                graph.commit(transaction)
+                transaction = graph.begin()
+                transaction_nodes = 0
+        graph.commit(transaction)
+    except BaseException:
+        # Consuming the subgraphs parses the xml, which may fail as well as neo4j.
+        # The open transaction would otherwise hold a connection of the pool.
+        graph.rollback(transaction)
+        raise
 
 
-@flow()
+@flow(task_runner=ConcurrentTaskRunner())  # type: ignore[no-untyped-call]
 def ingest_uniprot_into_neo4j_flow(data_directory_path: str = DEFAULT_DATA_DIR) -> None:
     """Flow ingesting UniProt xml files data into neo4j.
 
@@ -45,9 +130,13 @@ def ingest_uniprot_into_neo4j_flow(data_directory_path: str = DEFAULT_DATA_DIR)
                                    XML UniProt files to ingest.
     """
     data_directory: Path = Path(data_directory_path)
+    # The indexes are created once, before the loads run concurrently.
+    ensure_indexes(_graph(), UNITPROT2GRAPTH_CONFIG)
+    # The files are extracted and loaded concurrently.
+    # Loading parses the file, so parsing overlaps neo4j round trips.
     for xml_file in data_directory.glob("*.xml"):
-        subgraphs: py2neo.Subgraph = extract_from_xml(xml_file)
-        load_into_neo4j(subgraphs)
+        subgraphs = extract_from_xml.submit(xml_file)
+        load_into_neo4j.submit(subgraphs)  # type: ignore[call-overload]
 
 
 if __name__ == "__main__":  # pragma: no cover
@@ -1,16 +1,31 @@
 """Configures UniProt translation into properties graph."""
-import dateutil.parser
+import datetime
+from typing import Union
 
 from prot.xml_extract import XML2GraphConfig
 
+
+def parse_date(value: str) -> Union[datetime.date, datetime.datetime]:
+    """Parses an ISO 8601 date, as UniProt writes them.
+
+    Args:
+        value (str): the date, possibly with a time part.
+
+    Returns:
+        A date, or a datetime if the value has a time part.
+    """
+    try:
+        return datetime.date.fromisoformat(value)
+    except ValueError:
+        return datetime.datetime.fromisoformat(value)
+
+
 UNITPROT2GRAPTH_CONFIG = XML2GraphConfig(
     node_labels={
         "person": "Author",
     },
     property_types={
-        ("entry", "created"): (
-            lambda v: dateutil.parser.parse(v)  # pylint: disable=unnecessary-lambda
-        )
+        ("entry", "created"): parse_date,
     },
     relationship_labels={
         "organism": "IN_ORGANISM",
@@ -20,4 +35,27 @@ UNITPROT2GRAPTH_CONFIG = XML2GraphConfig(
         "authorList": "HAS_AUTHOR",
     },
     elements_for_merging_with_parents={"entry", "protein"},
+    batch_boundary_element="entry",
+    indexed_properties={
+        ("Accession", "value"),
+        ("Author", "name"),
+    },
+    text_free_elements={
+        "uniprot",
+        "recommendedName",
+        "alternativeName",
+        "gene",
+        "organism",
+        "lineage",
+        "reference",
+        "citation",
+        "dbReference",
+        "comment",
+        "subcellularLocation",
+        "isoform",
+        "interactant",
+        "feature",
+        "evidence",
+        "source",
+    },
 )
@@ -1,17 +1,104 @@
 """Provides XML parsing to extract properties graph."""
-import io
-import xml.sax  # nosec the input XML are trusted
+import enum
+import functools
+import mmap
+import string
+import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    KeysView,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+from xml.parsers import expat  # nosec the input XML are trusted
 
-import inflection
 import py2neo
 
 
+class ElementKind(enum.Enum):
+    """Kinds of translation of an XML element into the properties graph."""
+
+    NEW = enum.auto()
+    MERGE = enum.auto()
+    COLLECTION = enum.auto()
+
+
+AttributeTypes = Dict[str, Callable[[str], Any]]
+
+ElementDispatch = Tuple[ElementKind, str, str, Dict[str, str], AttributeTypes, bool]
+
+ElementStarter = Callable[[Dict[str, str]], None]
+
+PARSE_CHUNK_SIZE = 1 << 20
+
+
+@functools.lru_cache(maxsize=None)
+def _default_node_label(element_name: str) -> str:
+    return element_name[0].upper() + element_name[1:]
+
+
+_UPPERCASE = frozenset(string.ascii_uppercase)
+_LOWERCASE_OR_DIGIT = frozenset(string.ascii_lowercase + string.digits)
+_LOWERCASE = frozenset(string.ascii_lowercase)
+
+
+def _starts_word(name: str, index: int) -> bool:
+    if index == 0 or name[index] not in _UPPERCASE:
+        return False
+    previous = name[index - 1]
+    if previous in _LOWERCASE_OR_DIGIT:
+        return True
+    return (
+        previous in _UPPERCASE
+        and index + 1 < len(name)
+        and name[index + 1] in _LOWERCASE
+    )
+
+
+@functools.lru_cache(maxsize=4096)
+def _camel_to_upper_snake(name: str) -> str:
+    """Converts a camel case name into upper snake case, in a single pass.
+
+    An uppercase letter starts a new word after a lowercase letter or a digit,
+    and at the end of a sequence of uppercase letters followed by lowercase ones.
+    Hyphens become underscores.
+    For example, "authorList" becomes "AUTHOR_LIST", and "HTMLParser" becomes
+    "HTML_PARSER".
+
+    Args:
+        name (str): the camel case name.
+
+    Returns:
+        The upper snake case name.
+    """
+    snake_name = "".join(
+        [
+            "_" + char if _starts_word(name, index) else char
+            for index, char in enumerate(name)
+        ]
+    )
+    return snake_name.replace("-", "_").upper()
+
+
+@functools.lru_cache(maxsize=None)
+def _default_relationship_label(element_name: str) -> str:
+    return "HAS_" + _camel_to_upper_snake(element_name)
+
+
 class XML2GraphConfig:  # pylint: disable=too-few-public-methods
+    # pylint: disable=too-many-instance-attributes
     """Configures how to translate an XML document into a properties graph."""
 
-    def __init__(  # pylint: disable=too-many-arguments,
+    def __init__(  # pylint: disable=too-many-arguments,too-many-branches
         self,
         node_labels: Optional[Dict[str, str]] = None,
         property_names: Optional[Dict[Tuple[str, str], str]] = None,
@@ -19,6 +106,10 @@ class XML2GraphConfig:  # pylint: disable=too-few-public-methods
         relationship_labels: Optional[Dict[str, str]] = None,
         elements_for_merging_with_parents: Optional[Set[str]] = None,
         collection_elements: Optional[Dict[str, str]] = None,
+        batch_boundary_element: Optional[str] = None,
+        indexed_properties: Optional[Set[Tuple[str, str]]] = None,
+        text_free_elements: Optional[Set[str]] = None,
+        deduplicated_elements: Optional[Set[str]] = None,
     ) -> None:
         """Configures how to translate an XML document into a properties graph.
 
@@ -61,6 +152,36 @@ class XML2GraphConfig:  # pylint: disable=too-few-public-methods
                 the relationships to create.
                 Example:
                     {"authorList": "HAS_AUTHOR"}
+            batch_boundary_element:
+                Names the XML element whose end can close a batch of nodes and
+                relationships, when extracting them in batches.
+                Example:
+                    "entry"
+            indexed_properties:
+                Defines a set of pairs of node labels and property names to index
+                in the target graph database.
+                Example:
+                    {("Author", "name")}
+            text_free_elements:
+                Defines a set of XML elements whose text is ignored.
+                The extractor doesn't collect the text of the listed XML elements,
+                so it doesn't set their nodes value property.
+                Example:
+                    {"entry"}
+            deduplicated_elements:
+                Defines a set of XML elements whose equal nodes are shared.
+                When one of the listed XML elements ends with the same label and
+                properties as a previous one in the same document, the extractor
+                relates its parent with the previous node instead of creating
+                another. Only the elements without child nodes are shared, since
+                their label and properties are all there is to compare. It suits
+                elements whose equal property sets denote the same entity, and
+                whose property values are hashable.
+                The extractor keeps a record of every distinct shared node until
+                the end of the document, even when extracting it in batches.
+                So its memory grows with their number.
+                Example:
+                    {"evidence"}
         """
         if node_labels is None:
             self.node_labels: Dict[str, str] = {}
@@ -86,128 +207,759 @@ class XML2GraphConfig:  # pylint: disable=too-few-public-methods
             self.collection_elements: Dict[str, str] = {}
         else:
             self.collection_elements = collection_elements
+        self.batch_boundary_element = batch_boundary_element
+        if indexed_properties is None:
+            self.indexed_properties: Set[Tuple[str, str]] = set()
+        else:
+            self.indexed_properties = indexed_properties
+        if text_free_elements is None:
+            self.text_free_elements: Set[str] = set()
+        else:
+            self.text_free_elements = text_free_elements
+        if deduplicated_elements is None:
+            self.deduplicated_elements: Set[str] = set()
+        else:
+            self.deduplicated_elements = deduplicated_elements
+        self._dispatch: Dict[str, ElementDispatch] = {}
+        self._compile()
+
+    def _compile(self) -> None:
+        element_names = (
+            set(self.node_labels)
+            | {element_name for element_name, _ in self.property_names}
+            | {element_name for element_name, _ in self.property_types}
+            | set(self.relationship_labels)
+            | self.elements_for_merging_with_parents
+            | set(self.collection_elements)
+            | self.text_free_elements
+            | self.deduplicated_elements
+        )
+        for element_name in element_names:
+            self._dispatch[sys.intern(element_name)] = self._compute_dispatch(
+                element_name
+            )
+
+    @property
+    def element_names(self) -> KeysView[str]:
+        """The names of the XML elements whose translation is already computed.
+
+        The names are interned, so that parsers reusing them get dispatch table
+        lookups that succeed on identity.
+
+        Returns:
+            A view of the element names.
+        """
+        return self._dispatch.keys()
+
+    @property
+    def attribute_names(self) -> Set[str]:
+        """The names of the XML attributes with custom property names or types.
+
+        The names are interned, as the keys of the dispatch table attribute maps.
+
+        Returns:
+            A set of the attribute names.
+        """
+        return {
+            sys.intern(attr_name)
+            for _, attr_name in (*self.property_names, *self.property_types)
+        }
+
+    def _compute_dispatch(self, element_name: str) -> ElementDispatch:
+        if element_name in self.collection_elements:
+            kind = ElementKind.COLLECTION
+        elif element_name in self.elements_for_merging_with_parents:
+            kind = ElementKind.MERGE
+        else:
+            kind = ElementKind.NEW
+
+        if element_name in self.node_labels:
+            node_label = self.node_labels[element_name]
+        else:
+            node_label = _default_node_label(element_name)
+
+        if element_name in self.relationship_labels:
+            relationship_label = self.relationship_labels[element_name]
+        else:
+            relationship_label = _default_relationship_label(element_name)
+
+        property_names = {
+            sys.intern(attr_name): sys.intern(property_name)
+            for (configured_element_name, attr_name), property_name in (
+                self.property_names.items()
+            )
+            if configured_element_name == element_name
+        }
+        property_types: AttributeTypes = {
+            sys.intern(attr_name): property_type
+            for (configured_element_name, attr_name), property_type in (
+                self.property_types.items()
+            )
+            if configured_element_name == element_name
+        }
+
+        keeps_text = element_name not in self.text_free_elements
 
+        return (
+            kind,
+            node_label,
+            relationship_label,
+            property_names,
+            property_types,
+            keeps_text,
+        )
+
+    def dispatch(self, element_name: str) -> ElementDispatch:
+        """Returns how to translate an XML element.
+
+        The translation of the elements mentioned in the configuration is
+        precomputed. The translation of any other element is computed once,
+        the first time it is requested.
+
+        Args:
+            element_name (str): the XML element name.
+
+        Returns:
+            The element kind, the label of its node, the label of
+            the relationship with its parent node, the custom property names and
+            types of its attributes, and whether its text is collected.
+        """
+        try:
+            return self._dispatch[element_name]
+        except KeyError:
+            element_dispatch = self._compute_dispatch(element_name)
+            self._dispatch[sys.intern(element_name)] = element_dispatch
+            return element_dispatch
 
-class PropertiesSubgraphHandler(xml.sax.ContentHandler):
-    """SAX XML handler for collecting property graph's nodes and relationships."""
 
-    META_ATTR_PREFIXES = {"xmlns", "xsi"}
+class NodeRecord:
+    """Lightweight record of a node, collected while parsing.
+
+    Building py2neo nodes is costly, so the handler collects records instead, and
+    materializes them into py2neo nodes when a batch is complete.
+    A record may share the node of an equal, canonical record, instead of having
+    its own.
+    """
+
+    __slots__ = ("label", "properties", "node", "canonical")
+
+    def __init__(self, label: str, properties: Dict[str, Any]) -> None:
+        """Lightweight record of a node, collected while parsing.
+
+        Args:
+            label (str): the node label.
+            properties (Dict[str, Any]): the node properties.
+        """
+        self.label: str = label
+        self.properties: Dict[str, Any] = properties
+        self.node: Optional[py2neo.Node] = None
+        self.canonical: Optional[NodeRecord] = None
+
+    def merge(self, label: str, properties: Dict[str, Any]) -> None:
+        """Replaces the node label and extends its properties.
+
+        Args:
+            label (str): the new node label.
+            properties (Dict[str, Any]): the properties to add.
+        """
+        self.label = label
+        self.properties.update(properties)
+        if self.node is not None:
+            self.node.clear_labels()
+            self.node.add_label(label)
+            self.node.update(properties)
+
+    def set_property(self, name: str, value: Any) -> None:
+        """Sets a node property.
+
+        Args:
+            name (str): the property name.
+            value (Any): the property value.
+        """
+        self.properties[name] = value
+        if self.node is not None:
+            self.node[name] = value
+
+    def materialize(self) -> py2neo.Node:
+        """Returns the py2neo node for this record, building it once.
+
+        Returns:
+            The py2neo node, shared with the canonical record if there is one.
+        """
+        if self.node is None:
+            if self.canonical is None:
+                self.node = py2neo.Node(self.label, **self.properties)
+            else:
+                self.node = self.canonical.materialize()
+        return self.node
+
+
+RelationshipRecord = Tuple[NodeRecord, str, NodeRecord]
+
+# The nodes labels and properties, and the relationships between them, as pairs of
+# node indexes with a label. Unlike py2neo entities, they can be pickled.
+GraphRecords = Tuple[List[Tuple[str, Dict[str, Any]]], List[Tuple[int, str, int]]]
+
+
+class SubgraphBatch(py2neo.Subgraph):  # type: ignore[misc]
+    """A batch of the properties graph extracted from a XML file.
+
+    Besides its new nodes and relationships, a batch lists the nodes of previous
+    batches updated since they were extracted, e.g. the nodes of enclosing XML
+    elements that later XML content merges into. Creating the batch in a graph
+    leaves them unchanged, so they have to be pushed.
+    """
+
+    def __init__(
+        self,
+        nodes: Iterable[py2neo.Node],
+        relationships: Iterable[py2neo.Relationship],
+        updated_nodes: Iterable[py2neo.Node] = (),
+    ) -> None:
+        """A batch of the properties graph extracted from a XML file.
+
+        Args:
+            nodes (Iterable[py2neo.Node]): the new nodes.
+            relationships (Iterable[py2neo.Relationship]): the new relationships.
+            updated_nodes (Iterable[py2neo.Node]): the nodes of previous batches
+                updated since they were extracted.
+        """
+        super().__init__(nodes, relationships)
+        self.updated_nodes: List[py2neo.Node] = list(updated_nodes)
+
+
+class PropertiesSubgraphHandler:
+    # pylint: disable=too-many-instance-attributes
+    """Expat XML handler for collecting property graph's nodes and relationships."""
+
+    META_ATTR_PREFIXES = ("xmlns", "xsi")
     ELEMENT_TEXT_PROPERTY_NAME = "value"
 
+    __slots__ = (
+        "config",
+        "nodes",
+        "relationships",
+        "batch_size",
+        "batches",
+        "node_records",
+        "relationship_records",
+        "nodes_stack",
+        "text_stack",
+        "active_collection_element",
+        "active_collection_label",
+        "element_starters",
+        "element_kinds",
+        "batch_boundary_element",
+        "deduplicated_elements",
+        "unique_node_records",
+        "updated_records",
+        "interned_names",
+    )
+
     def __init__(
         self,
-        nodes: Set[py2neo.Node],
-        relationships: Set[py2neo.Relationship],
+        nodes: List[py2neo.Node],
+        relationships: List[py2neo.Relationship],
         config: XML2GraphConfig = XML2GraphConfig(),
+        batch_size: Optional[int] = None,
     ) -> None:
-        super().__init__()
         self.config: XML2GraphConfig = config
-        self.nodes: Set[py2neo.Node] = nodes
-        self.relationships: Set[py2neo.Relationship] = relationships
-        self.nodes_stack: List[py2neo.Node] = []
-        self.text_stack: List[io.StringIO] = []
+        self.nodes: List[py2neo.Node] = nodes
+        self.relationships: List[py2neo.Relationship] = relationships
+        self.batch_size: Optional[int] = batch_size
+        self.batches: List[SubgraphBatch] = []
+        self.node_records: List[NodeRecord] = []
+        self.relationship_records: List[RelationshipRecord] = []
+        self.nodes_stack: List[NodeRecord] = []
+        # Entries are None for the elements whose text is ignored, including the
+        # bottom entry, for the text outside of any node.
+        self.text_stack: List[Optional[str]] = [None]
         self.active_collection_element: Optional[str] = None
+        self.active_collection_label: Optional[str] = None
+        self.element_starters: Dict[str, ElementStarter] = {}
+        # Filled along with the element starters, since every element ends after
+        # it starts.
+        self.element_kinds: Dict[str, ElementKind] = {}
+        self.batch_boundary_element: Optional[str] = config.batch_boundary_element
+        self.deduplicated_elements: Set[str] = config.deduplicated_elements
+        self.unique_node_records: Dict[
+            Tuple[str, FrozenSet[Tuple[str, Any]]], NodeRecord
+        ] = {}
+        # The records of closed batches updated since, in order and without
+        # repetitions.
+        self.updated_records: Dict[NodeRecord, None] = {}
+        # Shared by the parsers of every document the handler collects, so that
+        # the element and attribute names of all of them are the same objects.
+        self.interned_names: Dict[str, str] = {
+            name: name for name in (*config.element_names, *config.attribute_names)
+        }
 
-    @classmethod
-    def _is_meta_attr(cls, attr: str) -> bool:
-        return any(attr.startswith(prefix) for prefix in cls.META_ATTR_PREFIXES)
-
-    def _node_label(self, element_name: str) -> str:
-        if element_name in self.config.node_labels:
-            return self.config.node_labels[element_name]
-
-        return element_name[0].upper() + element_name[1:]
-
-    def _relationship_label(self, element_name: str) -> str:
-        if self.active_collection_element:
-            return self.config.collection_elements[self.active_collection_element]
+    def reset(
+        self,
+        nodes: List[py2neo.Node],
+        relationships: List[py2neo.Relationship],
+        batch_size: Optional[int] = None,
+    ) -> None:
+        """Prepares the handler for collecting the graph of another XML document.
 
-        if element_name in self.config.relationship_labels:
-            return self.config.relationship_labels[element_name]
-        return "HAS_" + inflection.underscore(element_name).upper()
+        The handling specialized for the elements of previous documents is kept.
 
-    def _property_name(self, element_name: str, attr_name: str) -> str:
-        if (element_name, attr_name) in self.config.property_names:
-            return self.config.property_names[element_name, attr_name]
-        return attr_name
+        Args:
+            nodes (List[py2neo.Node]): the list to collect the nodes into.
+            relationships (List[py2neo.Relationship]): the list to collect
+                the relationships into.
+            batch_size (Optional[int]): minimum number of nodes in every batch
+                but the last, for extracting the graph in batches.
+        """
+        self.nodes = nodes
+        self.relationships = relationships
+        self.batch_size = batch_size
+        self.batches = []
+        self.node_records = []
+        self.relationship_records = []
+        self.nodes_stack = []
+        self.text_stack = [None]
+        self.active_collection_element = None
+        self.active_collection_label = None
+        self.unique_node_records = {}
+        self.updated_records = {}
 
-    def _property_value(
-        self, element_name: str, attr_name: str, attr_value: str
-    ) -> Any:
-        if (element_name, attr_name) in self.config.property_types:
-            return self.config.property_types[element_name, attr_name](attr_value)
-        return attr_value
+    def _properties(
+        self,
+        attrs: Dict[str, str],
+        property_names: Dict[str, str],
+        property_types: AttributeTypes,
+    ) -> Dict[str, Any]:
+        meta_attr_prefixes = self.META_ATTR_PREFIXES
+        if not property_names and not property_types:
+            # expat hands a fresh attributes dictionary to every start handler call.
+            for meta_attr in [k for k in attrs if k.startswith(meta_attr_prefixes)]:
+                del attrs[meta_attr]
+            return attrs
+        properties: Dict[str, Any] = {}
+        for attr_name, attr_value in attrs.items():
+            if attr_name.startswith(meta_attr_prefixes):
+                continue
+            property_type = property_types.get(attr_name)
+            properties[property_names.get(attr_name, attr_name)] = (
+                attr_value if property_type is None else property_type(attr_value)
+            )
+        return properties
 
-    def _start_collection(self, name: str) -> None:
+    def _start_collection(
+        self, name: str, relationship_label: str, _: Dict[str, str]
+    ) -> None:
         self.active_collection_element = name
+        self.active_collection_label = relationship_label
 
     def _merge_with_parent(self, node_label: str, properties: Dict[str, Any]) -> None:
-        node = self.nodes_stack[-1]
-        node.clear_labels()
-        node.add_label(node_label)
-        node.update(properties)
+        parent_record = self.nodes_stack[-1]
+        parent_record.merge(node_label, properties)
+        if parent_record.node is not None:
+            self.updated_records[parent_record] = None
 
     def _create_new_node(
-        self, node_label: str, properties: Dict[str, Any], relationship_label: str
+        self,
+        node_label: str,
+        properties: Dict[str, Any],
+        relationship_label: str,
+        keeps_text: bool,
     ) -> None:
-        node = py2neo.Node(node_label, **properties)
-        self.nodes.add(node)
+        node_record = NodeRecord(node_label, properties)
+        self.node_records.append(node_record)
         if self.nodes_stack:
-            parent_relationship = py2neo.Relationship(
-                self.nodes_stack[-1], relationship_label, node
+            self.relationship_records.append(
+                (self.nodes_stack[-1], relationship_label, node_record)
             )
-            self.relationships.add(parent_relationship)
-        self.nodes_stack.append(node)
-        self.text_stack.append(io.StringIO())
-
-    def startElement(self, name: str, attrs: Dict[str, str]) -> None:
-        node_label = self._node_label(name)
-        properties: Dict[str, str] = {
-            self._property_name(name, k): self._property_value(name, k, v)
-            for k, v in attrs.items()
-            if not self._is_meta_attr(k)
-        }
-        relationship_label = self._relationship_label(name)
-        if name in self.config.collection_elements:
-            self._start_collection(name)
-        elif name in self.config.elements_for_merging_with_parents and self.nodes_stack:
+        self.nodes_stack.append(node_record)
+        self.text_stack.append("" if keeps_text else None)
+
+    def _start_merge(  # pylint: disable=too-many-arguments
+        self,
+        node_label: str,
+        relationship_label: str,
+        property_names: Dict[str, str],
+        property_types: AttributeTypes,
+        keeps_text: bool,
+        attrs: Dict[str, str],
+    ) -> None:
+        properties = self._properties(attrs, property_names, property_types)
+        if self.nodes_stack:
             self._merge_with_parent(node_label, properties)
         else:
-            self._create_new_node(node_label, properties, relationship_label)
+            self._create_new_node(
+                node_label,
+                properties,
+                self.active_collection_label or relationship_label,
+                keeps_text,
+            )
+
+    def _start_new(  # pylint: disable=too-many-arguments
+        self,
+        node_label: str,
+        relationship_label: str,
+        property_names: Dict[str, str],
+        property_types: AttributeTypes,
+        keeps_text: bool,
+        attrs: Dict[str, str],
+    ) -> None:
+        self._create_new_node(
+            node_label,
+            self._properties(attrs, property_names, property_types),
+            self.active_collection_label or relationship_label,
+            keeps_text,
+        )
+
+    def _element_starter(self, name: str) -> ElementStarter:
+        (
+            kind,
+            node_label,
+            relationship_label,
+            property_names,
+            property_types,
+            keeps_text,
+        ) = self.config.dispatch(name)
+        self.element_kinds[name] = kind
+        if kind is ElementKind.COLLECTION:
+            return functools.partial(
+                self._start_collection, name, self.config.collection_elements[name]
+            )
+        if kind is ElementKind.MERGE:
+            element_starter = self._start_merge
+        else:
+            element_starter = self._start_new
+        return functools.partial(
+            element_starter,
+            node_label,
+            relationship_label,
+            property_names,
+            property_types,
+            keeps_text,
+        )
+
+    def start_element(self, name: str, attrs: Dict[str, str]) -> None:
+        """Handles the start of an XML element.
+
+        The handling of each element name is specialized once, binding its
+        translation to the handling of its kind, so that every other start of
+        the element is a single lookup and call.
+
+        Args:
+            name (str): the XML element name.
+            attrs (Dict[str, str]): the XML element attributes.
+        """
+        try:
+            element_starter = self.element_starters[name]
+        except KeyError:
+            element_starter = self.element_starters[name] = self._element_starter(name)
+        element_starter(attrs)
 
     def characters(self, content: str) -> None:
-        if self.text_stack:
-            self.text_stack[-1].write(content)
+        """Handles character data inside an XML element.
 
-    def endElement(self, name: str) -> None:
-        if (
-            self.nodes_stack
-            and name not in self.config.elements_for_merging_with_parents
-        ):
-            node = self.nodes_stack.pop()
-            element_text: str = self.text_stack.pop().getvalue().strip()
+        Args:
+            content (str): the character data.
+        """
+        text = self.text_stack[-1]
+        if text is not None:
+            # expat buffers the text, so it arrives in few, large parts.
+            self.text_stack[-1] = text + content
+
+    def end_element(self, name: str) -> None:
+        """Handles the end of an XML element.
+
+        Args:
+            name (str): the XML element name.
+        """
+        kind = self.element_kinds[name]
+        if kind is ElementKind.NEW:
+            node_record = self.nodes_stack.pop()
+            text = self.text_stack.pop()
+            element_text = text.strip() if text else ""
             if element_text:
-                node[self.ELEMENT_TEXT_PROPERTY_NAME] = element_text
-        if self.active_collection_element == name:
+                node_record.set_property(self.ELEMENT_TEXT_PROPERTY_NAME, element_text)
+                if node_record.node is not None:
+                    self.updated_records[node_record] = None
+            if (
+                name in self.deduplicated_elements
+                and node_record.node is None
+                and self.node_records[-1] is node_record
+            ):
+                self._deduplicate(node_record)
+        elif self.active_collection_element == name:
             self.active_collection_element = None
+            self.active_collection_label = None
+        if (
+            name == self.batch_boundary_element
+            and self.batch_size is not None
+            and len(self.node_records) >= self.batch_size
+        ):
+            self.close_batch()
+
+    def _deduplicate(self, node_record: NodeRecord) -> None:
+        # The record is complete, since its element ended, and its node isn't
+        # built yet, since it wasn't part of a closed batch. It has no children,
+        # since no record follows it, so its label and properties identify it.
+        key = (node_record.label, frozenset(node_record.properties.items()))
+        canonical = self.unique_node_records.setdefault(key, node_record)
+        if canonical is not node_record:
+            node_record.canonical = canonical
+
+    def materialize(self) -> None:
+        """Moves the collected records into the nodes and relationships."""
+        self.nodes.extend(
+            node_record.materialize()
+            for node_record in self.node_records
+            if node_record.canonical is None
+        )
+        self.relationships.extend(
+            py2neo.Relationship(
+                start_record.materialize(),
+                relationship_label,
+                end_record.materialize(),
+            )
+            for start_record, relationship_label, end_record in (
+                self.relationship_records
+            )
+        )
+        self.node_records.clear()
+        self.relationship_records.clear()
+
+    def close_batch(self) -> None:
+        """Moves the collected nodes and relationships into a new batch.
+
+        The batch also lists the nodes of previous batches updated since.
+        """
+        self.materialize()
+        self.batches.append(
+            SubgraphBatch(
+                self.nodes,
+                self.relationships,
+                [node_record.materialize() for node_record in self.updated_records],
+            )
+        )
+        self.nodes.clear()
+        self.relationships.clear()
+        self.updated_records.clear()
+
+
+def _prepare_handler(
+    handler: Optional[PropertiesSubgraphHandler],
+    config: XML2GraphConfig,
+    nodes: List[py2neo.Node],
+    relationships: List[py2neo.Relationship],
+    batch_size: Optional[int] = None,
+) -> PropertiesSubgraphHandler:
+    if handler is None:
+        return PropertiesSubgraphHandler(
+            nodes, relationships, config=config, batch_size=batch_size
+        )
+    handler.reset(nodes, relationships, batch_size)
+    return handler
+
+
+def _create_parser(handler: PropertiesSubgraphHandler) -> expat.XMLParserType:
+    parser = expat.ParserCreate(intern=handler.interned_names)
+    parser.buffer_text = True
+    parser.StartElementHandler = handler.start_element
+    parser.EndElementHandler = handler.end_element
+    parser.CharacterDataHandler = handler.characters
+    return parser
+
+
+def _parse_chunks(parser: expat.XMLParserType, xml_file: Path) -> Iterator[None]:
+    """Feeds a XML file into a parser, in chunks.
+
+    The file is memory-mapped, so that the parser reads the chunks straight from
+    the page cache, without copying them into intermediate bytes objects.
+
+    Args:
+        parser (expat.XMLParserType): the parser to feed.
+        xml_file (Path): xml file to parse.
+
+    Yields:
+        After parsing each chunk.
+    """
+    # Empty files can't be memory-mapped.
+    if xml_file.stat().st_size:
+        with xml_file.open("rb") as file, mmap.mmap(
+            file.fileno(), 0, access=mmap.ACCESS_READ
+        ) as mapped_file, memoryview(mapped_file) as data:
+            for start in range(0, len(data), PARSE_CHUNK_SIZE):
+                end = start + PARSE_CHUNK_SIZE
+                parser.Parse(data[start:end], False)
+                yield None
+    parser.Parse(b"", True)
+    yield None
 
 
 def extract_graph(
-    xml_file: Path, config: XML2GraphConfig = XML2GraphConfig()
+    xml_file: Path,
+    config: XML2GraphConfig = XML2GraphConfig(),
+    handler: Optional[PropertiesSubgraphHandler] = None,
 ) -> py2neo.Subgraph:
     """Extracts a properties graphs from a XML file.
 
     Args:
         xml_file (Path): xml file to extract.
         config (XML2GraphConfig): configures XML to graph translation.
+        handler (Optional[PropertiesSubgraphHandler]): a handler to reuse, e.g.
+            from the extraction of a previous file, instead of creating one for
+            config. It translates the XML according to its own configuration.
 
     Returns:
         A properties Subgraph extracted from the xml.
     """
-    nodes: Set[py2neo.Node] = set()
-    relationships: Set[py2neo.Relationship] = set()
-    xml.sax.parse(  # nosect the input XML are trusted
-        xml_file.absolute().as_posix(),
-        PropertiesSubgraphHandler(nodes, relationships, config=config),
+    nodes: List[py2neo.Node] = []
+    relationships: List[py2neo.Relationship] = []
+    handler = _prepare_handler(handler, config, nodes, relationships)
+    parser = _create_parser(handler)
+    for _ in _parse_chunks(parser, xml_file):
+        pass
+    handler.materialize()
+    return py2neo.Subgraph(nodes, relationships)
+
+
+def extract_graphs(
+    xml_file: Path,
+    config: XML2GraphConfig = XML2GraphConfig(),
+    batch_size: int = 1000,
+    handler: Optional[PropertiesSubgraphHandler] = None,
+) -> Iterator[SubgraphBatch]:
+    """Extracts a properties graph from a XML file, in batches.
+
+    A batch closes at the end of a batch boundary element, once it holds at least
+    batch_size nodes. Without a configured batch boundary element, it extracts a
+    single batch.
+    A batch may relate its nodes with nodes of previous batches (e.g. the nodes of
+    the enclosing XML elements), and update them. So the batches should be loaded
+    in order, pushing their updated nodes.
+
+    Args:
+        xml_file (Path): xml file to extract.
+        config (XML2GraphConfig): configures XML to graph translation.
+        batch_size (int): minimum number of nodes in every batch but the last.
+        handler (Optional[PropertiesSubgraphHandler]): a handler to reuse, e.g.
+            from the extraction of a previous file, instead of creating one for
+            config. It translates the XML according to its own configuration.
+            It must not be used by another extraction until this one completes.
+
+    Yields:
+        Batches of the properties graph extracted from the xml.
+    """
+    nodes: List[py2neo.Node] = []
+    relationships: List[py2neo.Relationship] = []
+    handler = _prepare_handler(handler, config, nodes, relationships, batch_size)
+    parser = _create_parser(handler)
+    for _ in _parse_chunks(parser, xml_file):
+        yield from handler.batches
+        handler.batches.clear()
+    if handler.node_records or handler.updated_records:
+        handler.close_batch()
+        yield handler.batches.pop()
+
+
+def _extract_records(xml_file: Path, config: XML2GraphConfig) -> GraphRecords:
+    handler = PropertiesSubgraphHandler([], [], config=config)
+    parser = _create_parser(handler)
+    for _ in _parse_chunks(parser, xml_file):
+        pass
+    node_records = [
+        node_record
+        for node_record in handler.node_records
+        if node_record.canonical is None
+    ]
+    node_indexes = {
+        node_record: index for index, node_record in enumerate(node_records)
+    }
+    return (
+        [(node_record.label, node_record.properties) for node_record in node_records],
+        [
+            (
+                node_indexes[start_record.canonical or start_record],
+                relationship_label,
+                node_indexes[end_record.canonical or end_record],
+            )
+            for start_record, relationship_label, end_record in (
+                handler.relationship_records
+            )
+        ],
     )
+
+
+def _graph_from_records(graph_records: GraphRecords) -> py2neo.Subgraph:
+    node_records, relationship_records = graph_records
+    nodes = [py2neo.Node(label, **properties) for label, properties in node_records]
+    relationships = [
+        py2neo.Relationship(nodes[start], relationship_label, nodes[end])
+        for start, relationship_label, end in relationship_records
+    ]
     return py2neo.Subgraph(nodes, relationships)
+
+
+def extract_graphs_in_parallel(
+    xml_files: Iterable[Path],
+    config: XML2GraphConfig = XML2GraphConfig(),
+    max_workers: Optional[int] = None,
+) -> Iterator[py2neo.Subgraph]:
+    """Extracts a properties graph from each of several XML files, in parallel.
+
+    Worker processes parse the files, so that parsing doesn't contend for the GIL.
+    They send back plain records, which are turned into py2neo entities here.
+    So config must be picklable, e.g. coercing values with module level functions
+    rather than lambdas.
+
+    Args:
+        xml_files (Iterable[Path]): xml files to extract.
+        config (XML2GraphConfig): configures XML to graph translation.
+        max_workers (Optional[int]): maximum number of worker processes.
+            By default, as many as processors.
+
+    Yields:
+        Properties Subgraphs extracted from the xml files, in the files order.
+    """
+    with ProcessPoolExecutor(max_workers) as executor:
+        for graph_records in executor.map(
+            functools.partial(_extract_records, config=config), xml_files
+        ):
+            yield _graph_from_records(graph_records)
+
+
+class SubgraphBatches:  # pylint: disable=too-few-public-methods
+    """Batches of the properties graph extracted from a XML file, on demand.
+
+    Every iteration parses the XML file, extracting the batches as they are
+    consumed. Unlike a generator, it can be iterated several times, and passed
+    around before being consumed.
+    """
+
+    def __init__(
+        self,
+        xml_file: Path,
+        config: XML2GraphConfig = XML2GraphConfig(),
+        batch_size: int = 1000,
+        handler_factory: Optional[Callable[[], PropertiesSubgraphHandler]] = None,
+    ) -> None:
+        """Batches of the properties graph extracted from a XML file, on demand.
+
+        Args:
+            xml_file (Path): xml file to extract.
+            config (XML2GraphConfig): configures XML to graph translation.
+            batch_size (int): minimum number of nodes in every batch but the last.
+            handler_factory (Optional[Callable[[], PropertiesSubgraphHandler]]):
+                returns a handler to reuse, when an iteration starts, instead of
+                creating one for config. It may return a handler per thread, so
+                that the batches of several files are consumed concurrently.
+        """
+        self.xml_file: Path = xml_file
+        self.config: XML2GraphConfig = config
+        self.batch_size: int = batch_size
+        self.handler_factory: Optional[
+            Callable[[], PropertiesSubgraphHandler]
+        ] = handler_factory
+
+    def __iter__(self) -> Iterator[SubgraphBatch]:
+        handler = None if self.handler_factory is None else self.handler_factory()
+        return extract_graphs(
+            self.xml_file, self.config, self.batch_size, handler=handler
+        )
@@ -1,12 +1,21 @@
 """Test prot flows."""
+import threading
 from pathlib import Path
-from typing import Iterable
+from typing import Iterable, Iterator, List
+from xml.parsers import expat  # nosec the test XML are trusted
 
 import pytest
 from prefect.testing.utilities import prefect_test_harness
 from py2neo import Graph, Node, Relationship, Subgraph
 
-from prot.flows import extract_from_xml, ingest_uniprot_into_neo4j_flow, load_into_neo4j
+from prot.flows import (
+    ensure_indexes,
+    extract_from_xml,
+    ingest_uniprot_into_neo4j_flow,
+    load_into_neo4j,
+    thread_handler,
+)
+from prot.xml_extract import SubgraphBatch, XML2GraphConfig
 
 
 @pytest.fixture
@@ -25,9 +34,38 @@ def graph() -> Iterable[Graph]:
 def test_task_extract_from_xml() -> None:
     """Test extracting the graph from the file using the uniprot2graph_config."""
     xml_file: Path = Path(__file__).parent.parent / "data" / "Q9Y261.xml"
-    subgraph: Subgraph = extract_from_xml.fn(xml_file)
-    assert len(subgraph.nodes) > 0
-    assert len(subgraph.relationships) > 0
+    subgraphs: List[Subgraph] = list(extract_from_xml.fn(xml_file))
+    assert len(subgraphs) > 0
+    assert all(len(subgraph.nodes) > 0 for subgraph in subgraphs)
+    assert all(len(subgraph.relationships) > 0 for subgraph in subgraphs)
+
+
+def test_thread_handler() -> None:
+    """Test reusing a parsing handler per thread."""
+    other_thread_handlers = []
+    thread = threading.Thread(
+        target=lambda: other_thread_handlers.append(thread_handler())
+    )
+    thread.start()
+    thread.join()
+
+    assert thread_handler() is thread_handler()
+    assert other_thread_handlers[0] is not thread_handler()
+
+
+def test_ensure_indexes(
+    graph: Graph,  # pylint: disable=redefined-outer-name
+) -> None:
+    """Test creating the indexes configured for the extracted graphs.
+
+    Args:
+        graph (Graph): clean py2neo Graph instance
+    """
+    config = XML2GraphConfig(indexed_properties={("Person", "name")})
+    ensure_indexes(graph, config)
+    ensure_indexes(graph, config)
+    indexes = graph.run("SHOW INDEXES YIELD labelsOrTypes, properties").data()
+    assert {"labelsOrTypes": ["Person"], "properties": ["name"]} in indexes
 
 
 def test_task_load_into_neo4j(
@@ -49,10 +87,69 @@ def test_task_load_into_neo4j(
     bob_carol = knows(bob, carol)
     carol_bob = knows(carol, bob)
     friends = alice_bob | bob_alice | alice_carol | carol_alice | bob_carol | carol_bob
-    load_into_neo4j.fn(friends)
+    load_into_neo4j.fn([friends])
     assert len(graph.nodes) == 3
 
 
+def test_task_load_into_neo4j_in_several_transactions(
+    graph: Graph,  # pylint: disable=redefined-outer-name
+) -> None:
+    """Test loading property graphs into neo4j, in several transactions.
+
+    Args:
+        graph (Graph): clean py2neo Graph instance
+    """
+    alice = Node("Person", name="Alice")
+    bob = Node("Person", name="Bob")
+    carol = Node("Person", name="Carol")
+    knows = Relationship.type("KNOWS")
+    load_into_neo4j.fn(
+        [knows(alice, bob), knows(bob, carol), knows(carol, alice)],
+        transaction_size=2,
+    )
+    assert len(graph.nodes) == 3
+    assert len(graph.relationships) == 3
+
+
+def test_task_load_into_neo4j_pushing_updated_nodes(
+    graph: Graph,  # pylint: disable=redefined-outer-name
+) -> None:
+    """Test loading batches that update the nodes of previous batches.
+
+    Args:
+        graph (Graph): clean py2neo Graph instance
+    """
+    entry = Node("Entry", version="0")
+
+    def batches() -> Iterator[SubgraphBatch]:
+        yield SubgraphBatch([entry], [])
+        entry["version"] = "1"
+        yield SubgraphBatch([Node("Accession", value="Q9Y261")], [], [entry])
+
+    load_into_neo4j.fn(batches(), transaction_size=1)
+    assert len(graph.nodes) == 2
+    assert graph.nodes.match("Entry").first()["version"] == "1"
+
+
+def test_task_load_into_neo4j_rolling_back_on_error(
+    graph: Graph,  # pylint: disable=redefined-outer-name
+) -> None:
+    """Test rolling back the open transaction when producing a Subgraph fails.
+
+    Args:
+        graph (Graph): clean py2neo Graph instance
+    """
+    knows = Relationship.type("KNOWS")
+
+    def subgraphs() -> Iterator[Subgraph]:
+        yield knows(Node("Person", name="Alice"), Node("Person", name="Bob"))
+        raise expat.ExpatError("no element found")
+
+    with pytest.raises(expat.ExpatError):
+        load_into_neo4j.fn(subgraphs())
+    assert len(graph.nodes) == 0
+
+
 def test_ingest_uniprot_into_neo4j_flow(
     graph: Graph,  # pylint: disable=redefined-outer-name
 ) -> None:
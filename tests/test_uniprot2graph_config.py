@@ -0,0 +1,14 @@
+"""Test UniProt translation configuration."""
+from datetime import date, datetime
+
+from prot.uniprot2graph_config import parse_date
+
+
+def test_parse_date() -> None:
+    """Test parsing UniProt dates."""
+    assert parse_date("2000-05-30") == date(2000, 5, 30)
+
+
+def test_parse_date_with_time() -> None:
+    """Test parsing UniProt dates with a time part."""
+    assert parse_date("2000-05-30T10:15:00") == datetime(2000, 5, 30, 10, 15)
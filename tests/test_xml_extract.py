@@ -1,12 +1,22 @@
 """Test prot module."""
 from datetime import date
 from pathlib import Path
-from typing import Any, FrozenSet, Iterable, Tuple
+from typing import Any, Iterable, List, Tuple
+from xml.parsers import expat  # nosec the test XML are trusted
 
 import dateutil.parser
+import pytest
 from py2neo import Node, Relationship, Subgraph
 
-from prot.xml_extract import XML2GraphConfig, extract_graph
+from prot import xml_extract
+from prot.xml_extract import (
+    PropertiesSubgraphHandler,
+    SubgraphBatches,
+    XML2GraphConfig,
+    extract_graph,
+    extract_graphs,
+    extract_graphs_in_parallel,
+)
 
 
 def create_xml_file(path: Path, content: str) -> Path:
@@ -26,17 +36,17 @@ def create_xml_file(path: Path, content: str) -> Path:
 
 def comparable_nodes(
     nodes: Iterable[Node],
-) -> FrozenSet[Tuple[FrozenSet[Any], FrozenSet[Tuple[Any, Any]]]]:
+) -> List[Tuple[Tuple[str, ...], Tuple[Tuple[str, Any], ...]]]:
     """Returns nodes in a comparable format.
 
     Args:
         nodes (Iterable[Node]): thee nodes iterable.
 
     Returns:
-        Returns a frozenset and tuple representation of the collection of nodes.
+        Returns a sorted list of tuple representations of the nodes.
     """
-    return frozenset(
-        (frozenset(node.labels), frozenset(node.items())) for node in nodes
+    return sorted(
+        (tuple(sorted(node.labels)), tuple(sorted(node.items()))) for node in nodes
     )
 
 
@@ -48,7 +58,7 @@ def equal_nodes(nodes: Iterable[Node], other_nodes: Iterable[Node]) -> bool:
         other_nodes (Iterable[Node]): another nodes iterable to compare.
 
     Returns:
-        True iff the two iterables contains exactly the same set of nodes.
+        True iff the two iterables contains exactly the same nodes, as many times.
     """
     return comparable_nodes(nodes) == comparable_nodes(other_nodes)
 
@@ -67,18 +77,17 @@ def has_relationships(
             (source_node_label, relationship_label, target_node_label).
 
     Returns:
-        True iff the relationships correspond to the tuples representing them.
+        True iff the relationships correspond to the tuples representing them,
+        one to one.
     """
-    return frozenset(
+    return sorted(
         (
-            frozenset(r.start_node.labels),
+            tuple(sorted(r.start_node.labels)),
             type(r).__name__,
-            frozenset(r.end_node.labels),
+            tuple(sorted(r.end_node.labels)),
         )
         for r in relationships
-    ) == frozenset(
-        (frozenset([s]), r, frozenset([t])) for s, r, t in relationship_tuples
-    )
+    ) == sorted(((s,), r, (t,)) for s, r, t in relationship_tuples)
 
 
 def test_extract_graph_without_configuration(tmp_path: Path) -> None:
@@ -136,6 +145,7 @@ def test_extract_graph_without_configuration(tmp_path: Path) -> None:
         [
             ("Uniprot", "HAS_ENTRY", "Entry"),
             ("Entry", "HAS_ACCESSION", "Accession"),
+            ("Entry", "HAS_ACCESSION", "Accession"),
             ("Entry", "HAS_PROTEIN", "Protein"),
             ("Protein", "HAS_RECOMMENDED_NAME", "RecommendedName"),
             ("RecommendedName", "HAS_FULL_NAME", "FullName"),
@@ -144,6 +154,53 @@ def test_extract_graph_without_configuration(tmp_path: Path) -> None:
     )
 
 
+def test_extract_graph_with_mixed_content(tmp_path: Path) -> None:
+    """Test task for extracting a properties subgraph from a xml file,
+       with text around child elements.
+
+    Args:
+        tmp_path: temporary directory for creating test data files.
+    """
+    xml_file_path: Path = create_xml_file(
+        tmp_path / "example.xml",
+        """<text>Hepatocyte nuclear <evidence key="1"/>factor 3-beta</text>""",
+    )
+
+    subgraph: Subgraph = extract_graph(xml_file_path)
+
+    assert equal_nodes(
+        subgraph.nodes,
+        [
+            Node("Text", value="Hepatocyte nuclear factor 3-beta"),
+            Node("Evidence", key="1"),
+        ],
+    )
+
+
+def test_extract_graph_with_text_free_elements(tmp_path: Path) -> None:
+    """Test task for extracting a properties subgraph from a xml file,
+       configuring elements whose text is ignored.
+
+    Args:
+        tmp_path: temporary directory for creating test data files.
+    """
+    xml_file_path: Path = create_xml_file(
+        tmp_path / "example.xml",
+        """<entry>Ignored <accession>Q9Y261</accession> text</entry>""",
+    )
+    config = XML2GraphConfig(text_free_elements={"entry"})
+
+    subgraph: Subgraph = extract_graph(xml_file_path, config)
+
+    assert equal_nodes(
+        subgraph.nodes,
+        [
+            Node("Entry"),
+            Node("Accession", value="Q9Y261"),
+        ],
+    )
+
+
 def test_extract_graph_with_node_lables_configuration(tmp_path: Path) -> None:
     """Test task for extracting a properties subgraph from a xml file,
        with custom node labels.
@@ -206,6 +263,34 @@ def test_extract_graph_with_custom_relationship_labels(tmp_path: Path) -> None:
     )
 
 
+def test_extract_graph_with_default_relationship_labels(tmp_path: Path) -> None:
+    """Test task for extracting a properties subgraph from a xml file,
+       with default relationships labels derived from camel case element names.
+
+    Args:
+        tmp_path: temporary directory for creating test data files.
+    """
+    xml_file_path: Path = create_xml_file(
+        tmp_path / "example.xml",
+        """<uniprot>
+            <dbReference></dbReference>
+            <PDBStructure></PDBStructure>
+            <gene-name></gene-name>
+        </uniprot>
+        """,
+    )
+
+    subgraph: Subgraph = extract_graph(xml_file_path)
+    assert has_relationships(
+        subgraph.relationships,
+        [
+            ("Uniprot", "HAS_DB_REFERENCE", "DbReference"),
+            ("Uniprot", "HAS_PDB_STRUCTURE", "PDBStructure"),
+            ("Uniprot", "HAS_GENE_NAME", "Gene-name"),
+        ],
+    )
+
+
 def test_extract_graph_with_custom_property_names(tmp_path: Path) -> None:
     """Test task for extracting a properties subgraph from a xml file,
        with custom property names.
@@ -232,6 +317,40 @@ def test_extract_graph_with_custom_property_names(tmp_path: Path) -> None:
     )
 
 
+def test_extract_graph_with_custom_property_names_and_meta_attributes(
+    tmp_path: Path,
+) -> None:
+    """Test task for extracting a properties subgraph from a xml file,
+       with custom property names for an element with meta attributes.
+
+    Args:
+        tmp_path: temporary directory for creating test data files.
+    """
+    xml_file_path: Path = create_xml_file(
+        tmp_path / "example.xml",
+        """
+        <entry
+            xmlns="http://uniprot.org/uniprot"
+            xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"
+            xsi:schemaLocation="http://uniprot.org/uniprot"
+            created="2000-05-30"
+        ></entry>
+        """,
+    )
+    config = XML2GraphConfig(
+        property_names={
+            ("entry", "created"): "created_at",
+        },
+    )
+    subgraph: Subgraph = extract_graph(xml_file_path, config)
+    assert equal_nodes(
+        subgraph.nodes,
+        [
+            Node("Entry", created_at="2000-05-30"),
+        ],
+    )
+
+
 def test_extract_graph_with_custom_attribute_value_types(tmp_path: Path) -> None:
     """Test task for extracting a properties subgraph from a xml file,
        with custom attribute value type.
@@ -388,3 +507,440 @@ def test_extract_graph_with_collection_elements(tmp_path: Path) -> None:
             ("Citation", "HAS_AUTHOR", "Person"),
         ],
     )
+
+
+def test_extract_graph_with_elements_after_collection_elements(tmp_path: Path) -> None:
+    """Test task for extracting a properties subgraph from a xml file,
+    configuring collection elements followed by sibling elements.
+
+    Args:
+        tmp_path: temporary directory for creating test data files.
+    """
+    xml_file_path: Path = create_xml_file(
+        tmp_path / "example.xml",
+        """
+        <citation>
+          <authorList>
+            <person name="Deloukas P."/>
+          </authorList>
+          <title>The DNA sequence and...</title>
+        </citation>
+    """,
+    )
+
+    config = XML2GraphConfig(collection_elements={"authorList": "HAS_AUTHOR"})
+    subgraph: Subgraph = extract_graph(xml_file_path, config=config)
+
+    assert len(subgraph.nodes) == 3
+    assert len(subgraph.relationships) == 2
+
+    assert has_relationships(
+        subgraph.relationships,
+        [
+            ("Citation", "HAS_AUTHOR", "Person"),
+            ("Citation", "HAS_TITLE", "Title"),
+        ],
+    )
+
+
+def test_extract_graph_with_deduplicated_elements(tmp_path: Path) -> None:
+    """Test task for extracting a properties subgraph from a xml file,
+       sharing the nodes of equal deduplicated elements without children.
+
+    Args:
+        tmp_path: temporary directory for creating test data files.
+    """
+    xml_file_path: Path = create_xml_file(
+        tmp_path / "example.xml",
+        """
+        <entry>
+          <evidence type="ECO:0000269"/>
+          <feature><evidence type="ECO:0000269"/></feature>
+          <evidence type="ECO:0000305"/>
+          <evidence type="ECO:0000313"><source id="1"/></evidence>
+          <evidence type="ECO:0000313"><source id="2"/></evidence>
+          <accession>Q9Y261</accession>
+          <accession>Q9Y261</accession>
+        </entry>
+        """,
+    )
+    config = XML2GraphConfig(deduplicated_elements={"evidence"})
+
+    subgraphs: List[Subgraph] = [
+        extract_graph(xml_file_path, config),
+        *extract_graphs_in_parallel([xml_file_path], config, max_workers=1),
+    ]
+
+    for subgraph in subgraphs:
+        assert equal_nodes(
+            subgraph.nodes,
+            [
+                Node("Entry"),
+                Node("Evidence", type="ECO:0000269"),
+                Node("Feature"),
+                Node("Evidence", type="ECO:0000305"),
+                Node("Evidence", type="ECO:0000313"),
+                Node("Source", id="1"),
+                Node("Evidence", type="ECO:0000313"),
+                Node("Source", id="2"),
+                Node("Accession", value="Q9Y261"),
+                Node("Accession", value="Q9Y261"),
+            ],
+        )
+        assert has_relationships(
+            subgraph.relationships,
+            [
+                ("Entry", "HAS_EVIDENCE", "Evidence"),
+                ("Entry", "HAS_FEATURE", "Feature"),
+                ("Feature", "HAS_EVIDENCE", "Evidence"),
+                ("Entry", "HAS_EVIDENCE", "Evidence"),
+                ("Entry", "HAS_EVIDENCE", "Evidence"),
+                ("Evidence", "HAS_SOURCE", "Source"),
+                ("Entry", "HAS_EVIDENCE", "Evidence"),
+                ("Evidence", "HAS_SOURCE", "Source"),
+                ("Entry", "HAS_ACCESSION", "Accession"),
+                ("Entry", "HAS_ACCESSION", "Accession"),
+            ],
+        )
+
+
+def test_extract_graphs_in_batches(tmp_path: Path) -> None:
+    """Test task for extracting properties subgraphs from a xml file in batches.
+
+    Args:
+        tmp_path: temporary directory for creating test data files.
+    """
+    xml_file_path: Path = create_xml_file(
+        tmp_path / "example.xml",
+        """
+        <uniprot>
+          <entry><accession>Q9Y261</accession></entry>
+          <entry><accession>Q8WUW4</accession></entry>
+          <entry><accession>Q96DF7</accession></entry>
+        </uniprot>
+    """,
+    )
+
+    config = XML2GraphConfig(batch_boundary_element="entry")
+    subgraphs: List[Subgraph] = list(
+        extract_graphs(xml_file_path, config=config, batch_size=2)
+    )
+
+    assert len(subgraphs) == 3
+    assert equal_nodes(
+        subgraphs[0].nodes,
+        [Node("Uniprot"), Node("Entry"), Node("Accession", value="Q9Y261")],
+    )
+    for subgraph, accession in zip(subgraphs[1:], ["Q8WUW4", "Q96DF7"]):
+        assert equal_nodes(
+            subgraph.nodes,
+            [Node("Uniprot"), Node("Entry"), Node("Accession", value=accession)],
+        )
+        assert has_relationships(
+            subgraph.relationships,
+            [
+                ("Uniprot", "HAS_ENTRY", "Entry"),
+                ("Entry", "HAS_ACCESSION", "Accession"),
+            ],
+        )
+
+
+def test_extract_graphs_without_batch_boundary(tmp_path: Path) -> None:
+    """Test task for extracting properties subgraphs from a xml file in batches,
+    without a batch boundary element.
+
+    Args:
+        tmp_path: temporary directory for creating test data files.
+    """
+    xml_file_path: Path = create_xml_file(
+        tmp_path / "example.xml",
+        """
+        <uniprot>
+          <entry><accession>Q9Y261</accession></entry>
+          <entry><accession>Q8WUW4</accession></entry>
+        </uniprot>
+    """,
+    )
+
+    subgraphs: List[Subgraph] = list(extract_graphs(xml_file_path, batch_size=2))
+
+    assert len(subgraphs) == 1
+    assert len(subgraphs[0].nodes) == 5
+    assert len(subgraphs[0].relationships) == 4
+
+
+def test_extract_graphs_updating_nodes_of_previous_batches(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test task for extracting properties subgraphs from a xml file in batches,
+    with nodes of previous batches updated by later XML content.
+
+    The batches are compared as they are yielded, since the nodes of the
+    previous batches keep changing afterwards.
+
+    Args:
+        tmp_path: temporary directory for creating test data files.
+        monkeypatch: fixture for patching the parsing chunk size.
+    """
+    monkeypatch.setattr(xml_extract, "PARSE_CHUNK_SIZE", 10)
+    xml_file_path: Path = create_xml_file(
+        tmp_path / "example.xml",
+        """
+        <uniprot>
+          <entry version="0"><accession>Q9Y261</accession></entry>
+          <entry version="1"><accession>Q8WUW4</accession></entry>
+          <protein name="P"/>
+          Text
+        </uniprot>
+    """,
+    )
+
+    config = XML2GraphConfig(
+        elements_for_merging_with_parents={"entry", "protein"},
+        batch_boundary_element="entry",
+    )
+    yielded_batches = [
+        (comparable_nodes(batch.nodes), comparable_nodes(batch.updated_nodes))
+        for batch in extract_graphs(xml_file_path, config=config, batch_size=1)
+    ]
+
+    assert yielded_batches == [
+        (
+            comparable_nodes(
+                [Node("Entry", version="0"), Node("Accession", value="Q9Y261")]
+            ),
+            [],
+        ),
+        (
+            comparable_nodes(
+                [Node("Entry", version="1"), Node("Accession", value="Q8WUW4")]
+            ),
+            comparable_nodes([Node("Entry", version="1")]),
+        ),
+        (
+            [],
+            comparable_nodes([Node("Protein", version="1", name="P", value="Text")]),
+        ),
+    ]
+
+
+def test_extract_graphs_deduplicating_nodes_of_previous_batches(
+    tmp_path: Path,
+) -> None:
+    """Test task for extracting properties subgraphs from a xml file in batches,
+    with a deduplicated element equal to one of a previous batch.
+
+    Args:
+        tmp_path: temporary directory for creating test data files.
+    """
+    xml_file_path: Path = create_xml_file(
+        tmp_path / "example.xml",
+        """
+        <uniprot>
+          <entry><evidence type="ECO:0000269"/></entry>
+          <entry><evidence type="ECO:0000269"/></entry>
+        </uniprot>
+    """,
+    )
+
+    config = XML2GraphConfig(
+        batch_boundary_element="entry",
+        deduplicated_elements={"uniprot", "evidence"},
+    )
+    subgraphs: List[Subgraph] = list(
+        extract_graphs(xml_file_path, config=config, batch_size=1)
+    )
+
+    assert [len(subgraph.nodes) for subgraph in subgraphs] == [3, 3]
+    first_batch_node_ids = {id(node) for node in subgraphs[0].nodes}
+    assert equal_nodes(
+        [node for node in subgraphs[1].nodes if id(node) in first_batch_node_ids],
+        [
+            Node("Uniprot"),
+            Node("Evidence", type="ECO:0000269"),
+        ],
+    )
+
+
+def test_extract_graphs_in_small_chunks(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test task for extracting properties subgraphs from a xml file parsed in
+    chunks smaller than its elements.
+
+    Args:
+        tmp_path: temporary directory for creating test data files.
+        monkeypatch: fixture for patching the parsing chunk size.
+    """
+    monkeypatch.setattr(xml_extract, "PARSE_CHUNK_SIZE", 7)
+    xml_file_path: Path = create_xml_file(
+        tmp_path / "example.xml",
+        """
+        <uniprot>
+          <entry><accession>Q9Y261</accession></entry>
+          <entry><accession>Q8WUW4</accession></entry>
+        </uniprot>
+    """,
+    )
+
+    config = XML2GraphConfig(batch_boundary_element="entry")
+    subgraphs: List[Subgraph] = list(
+        extract_graphs(xml_file_path, config=config, batch_size=2)
+    )
+
+    assert [len(subgraph.nodes) for subgraph in subgraphs] == [3, 3]
+    assert equal_nodes(
+        subgraphs[1].nodes,
+        [
+            Node("Uniprot"),
+            Node("Entry"),
+            Node("Accession", value="Q8WUW4"),
+        ],
+    )
+
+
+def test_extract_graph_from_empty_file(tmp_path: Path) -> None:
+    """Test task for extracting a properties subgraph from an empty file.
+
+    Args:
+        tmp_path: temporary directory for creating test data files.
+    """
+    xml_file_path: Path = create_xml_file(tmp_path / "example.xml", "")
+
+    with pytest.raises(expat.ExpatError):
+        extract_graph(xml_file_path)
+
+
+def test_extract_graphs_reusing_handler(tmp_path: Path) -> None:
+    """Test task for extracting properties subgraphs from several xml files,
+    reusing the same handler.
+
+    Args:
+        tmp_path: temporary directory for creating test data files.
+    """
+    first_xml_file_path: Path = create_xml_file(
+        tmp_path / "first.xml",
+        "<uniprot><entry><accession>Q9Y261</accession></entry></uniprot>",
+    )
+    second_xml_file_path: Path = create_xml_file(
+        tmp_path / "second.xml",
+        "<uniprot><entry><accession>Q8WUW4</accession></entry></uniprot>",
+    )
+    config = XML2GraphConfig()
+    handler = PropertiesSubgraphHandler([], [], config=config)
+
+    first_subgraph: Subgraph = extract_graph(first_xml_file_path, handler=handler)
+    element_starters = dict(handler.element_starters)
+    second_subgraphs: List[Subgraph] = list(
+        extract_graphs(second_xml_file_path, handler=handler)
+    )
+
+    assert handler.element_starters == element_starters
+    assert equal_nodes(
+        first_subgraph.nodes,
+        [
+            Node("Uniprot"),
+            Node("Entry"),
+            Node("Accession", value="Q9Y261"),
+        ],
+    )
+    assert len(second_subgraphs) == 1
+    assert equal_nodes(
+        second_subgraphs[0].nodes,
+        [
+            Node("Uniprot"),
+            Node("Entry"),
+            Node("Accession", value="Q8WUW4"),
+        ],
+    )
+
+
+def test_extract_graph_reusing_handler_shares_names(tmp_path: Path) -> None:
+    """Test task for extracting properties subgraphs from several xml files,
+    reusing the same handler, without copies of the same attribute name.
+
+    Args:
+        tmp_path: temporary directory for creating test data files.
+    """
+    xml_file_paths: List[Path] = [
+        create_xml_file(tmp_path / f"{accession}.xml", f'<entry id="{accession}"/>')
+        for accession in ("Q9Y261", "Q8WUW4")
+    ]
+    handler = PropertiesSubgraphHandler([], [], config=XML2GraphConfig())
+
+    attribute_names = [
+        next(iter(next(iter(extract_graph(path, handler=handler).nodes)).keys()))
+        for path in xml_file_paths
+    ]
+
+    assert attribute_names == ["id", "id"]
+    assert attribute_names[0] is attribute_names[1]
+
+
+def test_extract_graphs_in_parallel(tmp_path: Path) -> None:
+    """Test extracting properties subgraphs from several xml files in parallel.
+
+    Args:
+        tmp_path: temporary directory for creating test data files.
+    """
+    xml_file_paths: List[Path] = [
+        create_xml_file(
+            tmp_path / f"example{index}.xml",
+            f"""
+            <entry version="{index}">
+              <protein><name>Protein {index}</name></protein>
+              <accession>Q9Y26{index}</accession>
+            </entry>
+            """,
+        )
+        for index in range(3)
+    ]
+    config = XML2GraphConfig(
+        property_types={("entry", "version"): int},
+        elements_for_merging_with_parents={"protein"},
+    )
+
+    subgraphs: List[Subgraph] = list(
+        extract_graphs_in_parallel(xml_file_paths, config, max_workers=2)
+    )
+
+    assert len(subgraphs) == 3
+    for index, subgraph in enumerate(subgraphs):
+        assert equal_nodes(
+            subgraph.nodes,
+            [
+                Node("Protein", version=index),
+                Node("Name", value=f"Protein {index}"),
+                Node("Accession", value=f"Q9Y26{index}"),
+            ],
+        )
+        assert has_relationships(
+            subgraph.relationships,
+            [
+                ("Protein", "HAS_NAME", "Name"),
+                ("Protein", "HAS_ACCESSION", "Accession"),
+            ],
+        )
+
+
+def test_subgraph_batches(tmp_path: Path) -> None:
+    """Test iterating several times over the batches extracted from a xml file.
+
+    Args:
+        tmp_path: temporary directory for creating test data files.
+    """
+    xml_file_path: Path = create_xml_file(
+        tmp_path / "example.xml",
+        """
+        <uniprot>
+          <entry><accession>Q9Y261</accession></entry>
+          <entry><accession>Q8WUW4</accession></entry>
+        </uniprot>
+    """,
+    )
+
+    config = XML2GraphConfig(batch_boundary_element="entry")
+    batches = SubgraphBatches(xml_file_path, config=config, batch_size=1)
+
+    assert [len(subgraph.nodes) for subgraph in batches] == [3, 3]
+    assert [len(subgraph.nodes) for subgraph in batches] == [3, 3]